@@ -1,16 +1,35 @@
 import asyncio
+import collections
 import json
 import os
+import threading
 import time
 import uuid
-from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Optional, Tuple
+
+try:
+    from orjson import loads as json_loads  # parses bytes directly in C, no .decode() round-trip
+except ImportError:
+    json_loads = json.loads
 
 from bleak import BleakClient, BleakScanner
+from bleak.exc import BleakError
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
+import numpy as np
 
 import BLEDataCollector
+from BLEDataCollector.ring_buffer import RingBuffer
+
+# Samples kept per channel; ~32 s at 256 Hz, comfortably above the 3200-sample reads done by the game
+BUFFER_CAPACITY = 8192
+# Raw notifications waiting to be parsed; the oldest are dropped if the parser falls this far behind
+RX_QUEUE_SIZE = 4096
+# Upper bound for a JSON frame reassembled from several notifications
+MAX_FRAME_SIZE = 16384
+# Log entries are buffered and written in one call once either limit is reached
+LOG_FLUSH_ENTRIES = 64
+LOG_FLUSH_INTERVAL = 1.0  # seconds
 
 
 def run_ble_collector(collector: BLEDataCollector, device_name: str):
@@ -23,64 +42,244 @@ def run_ble_collector(collector: BLEDataCollector, device_name: str):
 class BLEDataCollector:
 
     def __init__(self):
-        self.count: int = 0
-        self.rate: float = 0.0
-        self.start_time: float = 0.0
-        self.processed_data: Dict[str, List[Any]] = {'A': [], 'B': []}
+        self.count: int = 0  # Packets parsed since the last rate update
+        self.rate: float = 0.0  # Packets per second, refreshed about once a second by the parser thread
+        self._rate_start_ns: int = time.monotonic_ns()
+        self.processed_data: Dict[str, RingBuffer] = {'A': RingBuffer(BUFFER_CAPACITY),
+                                                      'B': RingBuffer(BUFFER_CAPACITY)}
         self.is_running = True  # Flag to control the connection loop
+        # Created on the BLE thread's event loop in scan_and_connect; stop() sets it from other threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
 
         report_dir = os.path.join(os.getcwd(), "report")
         if not os.path.exists(report_dir):
             os.mkdir(report_dir)
+
+        # (notify_uuid, write_uuid) per device address, so reconnects skip the characteristics scan
+        self._char_cache_path = os.path.join(report_dir, "gatt_cache.json")
+        self._char_cache: Dict[str, List[str]] = self._load_char_cache()
+
         log_path = os.path.join(report_dir, f"{uuid.uuid4()}.txt")
         self.log_file = open(log_path, "w")
         print(f"Logging data to {log_path}")
+        self._log_buf: List[str] = []
+        self._log_lock = threading.Lock()
+        self._log_last_flush = time.monotonic()
+        self._log_last_sec = -1  # second for which the timestamp prefix below was formatted
+        self._log_prefix = ""
+
+        # Notifications are only queued in the Bleak callback and parsed in batches on this thread
+        self._rx = collections.deque(maxlen=RX_QUEUE_SIZE)
+        self._partial_frame = b""  # Start of a frame whose remaining notifications have not arrived yet
+        self._rx_ready = threading.Event()
+        self._parser_stop = threading.Event()
+        self._parser_thread = threading.Thread(target=self._parse_loop, daemon=True)
+        self._parser_thread.start()
 
     def _get_datetime(self) -> str:
-        return datetime.now().strftime("%m/%d/%Y, %H:%M:%S.%f")
+        now = time.time()
+        sec = int(now)
+        if sec != self._log_last_sec:  # strftime only once per second
+            self._log_prefix = time.strftime("%m/%d/%Y, %H:%M:%S", time.localtime(sec))
+            self._log_last_sec = sec
+        return f"{self._log_prefix}.{int((now - sec) * 1e6):06d}"
 
     def log(self, message: str, title: str = "INFO"):
         log_entry = f"{self._get_datetime()} : {title} \t {message}\n"
-        self.log_file.write(log_entry)
+        with self._log_lock:
+            if self.log_file.closed:  # close() already ran, e.g. while the parser thread was still finishing
+                return
+            self._log_buf.append(log_entry)
+            if (len(self._log_buf) >= LOG_FLUSH_ENTRIES
+                    or time.monotonic() - self._log_last_flush >= LOG_FLUSH_INTERVAL):
+                self._flush_log()
+
+    def _flush_log(self):
+        """Writes all buffered log entries at once; a no-op once the log file is closed. Callers must hold _log_lock."""
+        if self._log_buf and not self.log_file.closed:
+            self.log_file.write("".join(self._log_buf))
+            self._log_buf.clear()
+        self._log_last_flush = time.monotonic()
 
     def _on_data_received(self, sender: BleakGATTCharacteristic, data: bytearray):
-        self.count += 1
-        elapsed_time = time.time() - self.start_time
-        if elapsed_time >= 1.0:
-            self.rate = self.count / elapsed_time
+        self._rx.append(bytes(data))
+        self._rx_ready.set()
+
+    def _parse_loop(self):
+        """Target function for the parser thread. Drains queued notifications until close() is called."""
+        while not self._parser_stop.is_set():
+            self._rx_ready.wait(timeout=0.5)
+            self._rx_ready.clear()
+            self._drain_rx_safely()
+            if self._log_buf and time.monotonic() - self._log_last_flush >= LOG_FLUSH_INTERVAL:
+                with self._log_lock:
+                    self._flush_log()
+        self._drain_rx_safely()
+
+    def _drain_rx_safely(self):
+        """_drain_rx, but any unexpected error is logged instead of ending the parser thread."""
+        try:
+            self._drain_rx()
+        except Exception as e:
+            self.log(title="ERROR", message=f"Failed to process received data: {e}")
+
+    def _update_rate(self, num_packets: int):
+        self.count += num_packets
+        now = time.monotonic_ns()
+        elapsed_ns = now - self._rate_start_ns
+        if elapsed_ns >= 1_000_000_000:
+            self.rate = self.count * 1e9 / elapsed_ns
             self.count = 0
-            self.start_time = time.time()
+            self._rate_start_ns = now
+
+    def _drain_rx(self):
+        samples_a, samples_b = [], []
+        num_packets = 0
+        while self._rx:
+            num_packets += 1
+            frame = self._reassemble(self._rx.popleft())
+            if frame is None:
+                continue
+            try:
+                res = json_loads(frame)
+                packet_a = self._packet_samples(res, 'A')
+                packet_b = self._packet_samples(res, 'B')
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                self.log(title="ERROR", message=f"Failed to decode data: {e}")
+                continue
+            except (ValueError, TypeError, AttributeError) as e:
+                # Valid JSON with unusable contents only costs that packet
+                self.log(title="ERROR", message=f"Dropped malformed packet: {e}")
+                continue
+            samples_a.append(packet_a)
+            samples_b.append(packet_b)
+        # One ring-buffer write per channel for the whole batch
+        if samples_a:
+            self.processed_data['A'].extend(np.concatenate(samples_a))
+            self.processed_data['B'].extend(np.concatenate(samples_b))
+        self._update_rate(num_packets)
+
+    @staticmethod
+    def _packet_samples(packet, channel: str) -> np.ndarray:
+        """
+        Converts one channel of a decoded packet to a 1D float32 array.
+
+        Raises ValueError, TypeError or AttributeError if the packet is not a dict of flat lists of numbers.
+        """
+        samples = np.asarray(packet.get(channel, ()), dtype=np.float32)
+        if samples.ndim != 1:
+            raise TypeError(f"channel {channel} is not a list of samples: {packet.get(channel)!r}")
+        if not np.isfinite(samples).all():  # e.g. null, which NumPy would silently turn into NaN
+            raise ValueError(f"channel {channel} has non-numeric samples: {packet.get(channel)!r}")
+        return samples
+
+    def _reassemble(self, packet: bytes) -> Optional[bytes]:
+        """
+        Joins JSON frames split across several notifications.
+
+        Returns the complete frame once its closing brace arrives, or None while it is still partial.
+        Only called from the parser thread.
+        """
+        if self._partial_frame:
+            if packet.startswith(b"{"):  # A new frame began before the previous one was completed
+                self.log(title="ERROR", message=f"Dropped incomplete frame of {len(self._partial_frame)} bytes")
+                self._partial_frame = b""
+            else:
+                packet = self._partial_frame + packet
+                self._partial_frame = b""
+
+        if packet.rstrip().endswith(b"}"):
+            return packet
+        if len(packet) > MAX_FRAME_SIZE:
+            self.log(title="ERROR", message=f"Dropped frame exceeding {MAX_FRAME_SIZE} bytes")
+            return None
+        self._partial_frame = packet
+        return None
+
+    def _load_char_cache(self) -> Dict[str, List[str]]:
+        try:
+            with open(self._char_cache_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_char_cache(self):
+        # The cache only saves a characteristics scan on the next connect; failing to write it is not fatal
         try:
-            res = json.loads(data.decode())
-            self.processed_data['A'].extend(res.get('A', []))
-            self.processed_data['B'].extend(res.get('B', []))
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            self.log(title="ERROR", message=f"Failed to decode data: {e}")
+            with open(self._char_cache_path, "w") as f:
+                json.dump(self._char_cache, f)
+        except OSError as e:
+            self.log(title="ERROR", message=f"Failed to save GATT cache: {e}")
+
+    def _remember_chars(self, address: str, chars: Optional[Tuple[str, str]]):
+        """Stores (or, if chars is None, forgets) the characteristics of a device and saves the cache."""
+        if chars:
+            self._char_cache[address] = list(chars)
+        else:
+            self._char_cache.pop(address, None)
+        self._save_char_cache()
+
+    @staticmethod
+    def _find_characteristics(client: BleakClient) -> Optional[Tuple[str, str]]:
+        """Single pass over the GATT services for the first notify and the first write characteristic."""
+        notify_char = write_char = None
+        for service in client.services:
+            for char in service.characteristics:
+                if notify_char is None and "notify" in char.properties:
+                    notify_char = char
+                if write_char is None and "write" in char.properties:
+                    write_char = char
+                if notify_char and write_char:
+                    return notify_char.uuid, write_char.uuid
+        return None
+
+    async def _start_streaming(self, client: BleakClient, notify_uuid: str, write_uuid: str):
+        await client.write_gatt_char(write_uuid, bytearray([0x39]), response=True)
+        await client.start_notify(notify_uuid, self._on_data_received)
 
     # MODIFIED for Pygame integration
     async def connect_device(self, device: BLEDevice):
         print(f"Connecting to {device.name} ({device.address})")
         async with BleakClient(device.address) as client:
             print(f"Connected: {client.is_connected}")
-            notify_char = next((c for s in client.services for c in s.characteristics if "notify" in c.properties),
-                               None)
-            write_char = next((c for s in client.services for c in s.characteristics if "write" in c.properties), None)
+            cached = self._char_cache.get(device.address)
+            chars = cached
+            if chars is None:
+                chars = self._find_characteristics(client)
+                if chars:
+                    self._remember_chars(device.address, chars)
 
-            if notify_char and write_char:
-                await client.write_gatt_char(write_char.uuid, bytearray([0x39]), response=True)
-                await client.start_notify(notify_char.uuid, self._on_data_received)
+            if chars:
+                notify_uuid, write_uuid = chars
+                try:
+                    await self._start_streaming(client, notify_uuid, write_uuid)
+                except BleakError as e:
+                    if cached is None:
+                        raise
+                    # Stale entry (e.g. after a firmware update): rediscover on this connection and retry once
+                    self.log(title="ERROR", message=f"Cached characteristics failed ({e}), rediscovering")
+                    chars = self._find_characteristics(client)
+                    self._remember_chars(device.address, chars)
+                    if not chars:
+                        raise
+                    notify_uuid, write_uuid = chars
+                    await self._start_streaming(client, notify_uuid, write_uuid)
 
-                # Loop indefinitely, allowing the connection to persist while Pygame runs
-                while self.is_running:
-                    await asyncio.sleep(0.1)  # Yield control, checking the flag every 100ms
+                # Hold the connection open while Pygame runs, until stop() is called
+                await self._stop_event.wait()
 
-                await client.stop_notify(notify_char.uuid)
+                await client.stop_notify(notify_uuid)
             else:
                 print("Error: Could not find required characteristics.")
         print(f"{device.name} disconnected.")
 
-    # (scan_and_connect, get_current_data, and close methods are IDENTICAL to the previous version)
     async def scan_and_connect(self, auto_connect_device: str = ""):
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        if not self.is_running:  # stop() was called before the loop existed
+            self._stop_event.set()
+
         print("Scanning for devices...")
         device = await BleakScanner.find_device_by_name(auto_connect_device)
         if device:
@@ -88,22 +287,50 @@ class BLEDataCollector:
         else:
             print(f"Device '{auto_connect_device}' not found.")
 
-    def get_current_data(self, num_samples: int = 500) -> List[Any]:
-        return [
-            self.processed_data['A'][-num_samples:],
-            self.processed_data['B'][-num_samples:],
+    def get_current_data(self, num_samples: int = 500, out: Optional[np.ndarray] = None) -> List[np.ndarray]:
+        """
+        Returns the latest num_samples samples of channels A and B.
+
+        By default these are read-only views into the ring buffers (see RingBuffer.tail). If out is
+        given, a (2, >= num_samples) array, the samples are copied into its rows instead and views of
+        those rows are returned, so a caller polling every frame can reuse one buffer.
+        """
+        tails = [
+            self.processed_data['A'].tail(num_samples),
+            self.processed_data['B'].tail(num_samples),
         ]
+        if out is None:
+            return tails
+        rows = []
+        for row, samples in zip(out, tails):
+            dst = row[:samples.shape[0]]
+            np.copyto(dst, samples)
+            rows.append(dst)
+        return rows
 
     def close(self):
+        self._parser_stop.set()
+        self._rx_ready.set()
+        self._parser_thread.join(timeout=2)
         if self.log_file and not self.log_file.closed:
-            print(f"\nClosing log file: {self.log_file.name}")
-            self.log_file.close()
+            # Flush and close under the lock, so a parser thread that outlived the join cannot write in between
+            with self._log_lock:
+                self._flush_log()
+                print(f"\nClosing log file: {self.log_file.name}")
+                self.log_file.close()
 
     # NEW method for graceful shutdown
     def stop(self):
         """Signals the async loop to stop."""
         print("Stopping BLE connection...")
         self.is_running = False
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # The event loop has already finished
 
     def clear_data(self):
-        self.processed_data = {'A': [], 'B': []}
+        for buffer in self.processed_data.values():
+            buffer.clear()
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity sample buffer backed by a preallocated NumPy array.
+
+    Once full, new samples overwrite the oldest ones, so memory stays bounded for the
+    whole session. Every sample is written twice, capacity apart, into a backing array of
+    twice the capacity; the most recent samples are therefore always one contiguous slice
+    and tail() can return a view instead of stitching two pieces together.
+    Intended for a single writer (the BLE thread) and any number of readers.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        self.capacity = capacity
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._head = 0  # next write position, in [0, capacity)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def extend(self, samples) -> None:
+        """Appends samples, wrapping around the end of the buffer at most once."""
+        samples = np.asarray(samples, dtype=self._buf.dtype)
+        n = samples.shape[0]
+        if n == 0:
+            return
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        cap = self.capacity
+        head = self._head
+        first = min(n, cap - head)
+        self._buf[head:head + first] = samples[:first]
+        self._buf[cap + head:cap + head + first] = samples[:first]
+        if first < n:
+            self._buf[:n - first] = samples[first:]
+            self._buf[cap:cap + n - first] = samples[first:]
+
+        self._head = (head + n) % cap
+        self.size = min(self.size + n, cap)
+
+    def tail(self, num_samples: int) -> np.ndarray:
+        """
+        Returns a read-only view of the most recent num_samples samples, oldest first.
+
+        The view stays valid until more than capacity - num_samples new samples have been
+        written; copy it if it has to be kept for longer.
+        """
+        n = min(num_samples, self.size)
+        end = self._head + self.capacity
+        view = self._buf[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def clear(self) -> None:
+        self._head = 0
+        self.size = 0
@@ -0,0 +1,93 @@
+"""Numba kernels for the Welch PSD and band-power reduction in brainflow_stream.compute_band_powers."""
+import numpy as np
+from numba import njit, prange
+
+# fastmath without "nnan": a non-positive total power has to come out as NaN, as in the NumPy path
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(cache=True, fastmath=_FASTMATH, inline="always")
+def _trapz(freqs, psd_row, k0, k1):
+    """np.trapz(psd_row[k0:k1], freqs[k0:k1]); fewer than two bins integrate to 0."""
+    area = 0.0
+    for k in range(k0, k1 - 1):
+        area += (freqs[k + 1] - freqs[k]) * (psd_row[k] + psd_row[k + 1])
+    return 0.5 * area
+
+
+@njit(cache=True, fastmath=_FASTMATH, parallel=True)
+def band_powers_kernel(freqs, psd, bins, relative, log, tiny, out):
+    """
+    Fused band reduction of psd (n_epochs, n_channels, n_freqs) into out (n_epochs, n_bands).
+
+    For every channel, band j is integrated over the bin range bins[j, 0]:bins[j, 1] with the trapezoidal
+    rule; if relative, the last row of bins is the total band and the other bands are divided by it (NaN when
+    it is not positive); if log, the result becomes 10 * log10(max(power, tiny)). The per-channel values are
+    then averaged over channels, all in one pass with epochs spread over threads. Returns out.
+    """
+    n_epochs, n_channels = psd.shape[0], psd.shape[1]
+    n_bands = out.shape[1]
+    for e in prange(n_epochs):
+        for j in range(n_bands):
+            out[e, j] = 0.0
+        for c in range(n_channels):
+            total = 1.0
+            if relative:
+                total = _trapz(freqs, psd[e, c], bins[n_bands, 0], bins[n_bands, 1])
+                if total <= 0.0:
+                    total = np.nan
+            for j in range(n_bands):
+                power = _trapz(freqs, psd[e, c], bins[j, 0], bins[j, 1]) / total
+                if log:
+                    power = 10.0 * np.log10(max(power, tiny))
+                out[e, j] += power
+        for j in range(n_bands):
+            out[e, j] /= n_channels
+    return out
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def demean_window(segments, window, out):
+    """
+    out = (segments - segments.mean(axis=-1, keepdims=True)) * window for segments of shape
+    (n_batch, n_channels, n_segments, nperseg), in a single pass per segment with no demeaned intermediate.
+
+    Serial on purpose: at a few (3, 500) epochs the thread start-up of a parallel loop costs more than the
+    loop itself. Returns out.
+    """
+    n_batch, n_channels, n_segments, nperseg = segments.shape
+    for b in range(n_batch):
+        for c in range(n_channels):
+            for s in range(n_segments):
+                mean = 0.0
+                for n in range(nperseg):
+                    mean += segments[b, c, s, n]
+                mean /= nperseg
+                for n in range(nperseg):
+                    out[b, c, s, n] = (segments[b, c, s, n] - mean) * window[n]
+    return out
+
+
+def _warm_up():
+    """
+    Compiles (or loads from the on-disk cache) the float32 and float64 specialisations up front, with the
+    argument types compute_band_powers passes: read-only freqs and bins from its cached plans, Python scalars.
+    """
+    freqs = np.arange(4.0)
+    bins = np.array([[0, 4], [0, 4]], dtype=np.intp)
+    freqs.flags.writeable = bins.flags.writeable = False
+    for dtype in (np.float32, np.float64):
+        psd = np.ones((1, 1, 4), dtype=dtype)
+        band_powers_kernel(freqs, psd, bins, True, False, float(np.finfo(dtype).tiny), np.empty((1, 1), dtype=dtype))
+        # _welch_psd passes read-only segment views, strided or (for a single full-length segment) contiguous,
+        # and its cached read-only window
+        window = np.ones(4, dtype=dtype)
+        window.flags.writeable = False
+        for n_samples in (8, 4):
+            segments = np.lib.stride_tricks.sliding_window_view(np.ones((1, 1, n_samples), dtype=dtype), 4, axis=-1)
+            segments = segments[..., ::2, :]
+            demean_window(segments, window, np.empty(segments.shape, dtype=dtype))
+
+
+# At import rather than on the first real epoch, so the acquisition loop never waits on the compiler
+_warm_up()
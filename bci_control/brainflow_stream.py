@@ -1,12 +1,68 @@
+import copy
+import itertools
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
 import serial.tools.list_ports
-from brainflow.board_shim import BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds
+from brainflow.board_shim import (BoardShim, BrainFlowInputParams, BrainFlowError, BoardIds, BoardControllerDLL,
+                                  BrainFlowExitCodes, BrainFlowPresets)
+
+
+@lru_cache(maxsize=None)
+def _board_descr(board_id):
+    """BoardShim.get_board_descr, fetched from BrainFlow once per board ID. Treat the result as read-only."""
+    return BoardShim.get_board_descr(board_id)
+
+
+@lru_cache(maxsize=None)
+def _sampling_rate(board_id):
+    """BoardShim.get_sampling_rate, fetched from BrainFlow once per board ID."""
+    return BoardShim.get_sampling_rate(board_id)
+
+
+@lru_cache(maxsize=None)
+def _num_rows(board_id):
+    """BoardShim.get_num_rows for the default preset, fetched from BrainFlow once per board ID."""
+    return BoardShim.get_num_rows(board_id)
+
+
+def _last_port_path():
+    return os.path.join(os.getcwd(), "report", ".last_port.json")
+
+
+def _load_last_port(board_id):
+    """Returns the serial port the given board ID last streamed from, or None if unknown."""
+    try:
+        with open(_last_port_path(), "r") as f:
+            return json.load(f).get(str(board_id))
+    except (FileNotFoundError, ValueError, AttributeError):
+        return None
+
+
+def _save_last_port(board_id, serial_port):
+    """Remembers serial_port as the last known-good port for board_id, so setup() can skip the port scan."""
+    path = _last_port_path()
+    try:
+        with open(path, "r") as f:
+            last_ports = json.load(f)
+    except (FileNotFoundError, ValueError):
+        last_ports = {}
+    last_ports[str(board_id)] = serial_port
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(last_ports, f)
 
 
 class BrainFlowBoard:
     """
     A class to manage the setup, configuration, and control of a BrainFlow board.
     This class provides methods for initializing, configuring, and streaming data from the board.
-    It also enables access to all attributes and methods from the BoardShim instance (even if not explicitly defined in this class).
+    Once set up, the BoardShim instance methods not wrapped by this class (see _BOARD_SHIM_METHODS) are bound
+    directly onto the instance, so they can be called as if they were defined here.
     
     Attributes:
         name (str): A user-friendly name or identifier for the board setup instance.
@@ -21,7 +77,12 @@ class BrainFlowBoard:
         sampling_rate (int): Sampling rate of the board.
     """
 
-    _id_counter = 0  # Class-level variable to assign default IDs
+    _id_counter = itertools.count()  # Class-level counter to assign default IDs
+
+    # BoardShim methods exposed on the instance after setup(); the wrapped ones are defined below
+    _BOARD_SHIM_METHODS = ('prepare_session', 'start_stream', 'stop_stream', 'release_session', 'is_prepared',
+                           'get_board_id', 'get_board_data_count', 'config_board', 'config_board_with_bytes',
+                           'add_streamer', 'delete_streamer')
 
     def __init__(self, board_id, serial_port=None, master_board=None, name=None, **kwargs):
         """
@@ -34,16 +95,15 @@ class BrainFlowBoard:
             name (str, optional): A user-friendly name or identifier for this instance. Defaults to 'Board X'.
             **kwargs: Additional keyword arguments to be set as attributes on the BrainFlowInputParams instance.
         """
-        self.instance_id = BrainFlowBoard._id_counter  # Unique identifier for each instance
-        BrainFlowBoard._id_counter += 1
+        self.instance_id = next(BrainFlowBoard._id_counter)  # Unique identifier for each instance
+        self._current_size = np.zeros(1, dtype=np.int32)  # sample-count out-parameter of get_current_board_data_into
 
         self.board_id = board_id
         self.serial_port = serial_port
         self.master_board = master_board
 
-        # Assign default name if not provided, based on the class-level ID counter
-        self.name = name or f"Board {BrainFlowBoard._id_counter}"
-        BrainFlowBoard._id_counter += 1
+        # Assign default name if not provided, based on the instance ID
+        self.name = name or f"Board {self.instance_id}"
 
         # Initialize BrainFlow input parameters
         self.params = BrainFlowInputParams()
@@ -73,25 +133,6 @@ class BrainFlowBoard:
         self.session_prepared = False
         self.streaming = False
 
-    def __getattr__(self, name):
-        """
-        Delegates attribute access to the BoardShim instance if the attribute is not found in the current instance.
-        This allows access to BoardShim-specific attributes that may not be directly defined in the BrainFlowBoardSetup class.
-
-        Args:
-            name (str): The name of the attribute to be accessed.
-
-        Returns:
-            The attribute from the BoardShim instance if it exists.
-
-        Raises:
-            AttributeError: If the attribute is not found in the current instance or the BoardShim instance.
-        """
-        if self.board is not None and hasattr(self.board, name):
-            return getattr(self.board, name)
-        else:
-            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
-
     def get_board_info(self):
         """
         Retrieves the EEG channels and sampling rate for the board. Uses the master board if provided.
@@ -108,13 +149,36 @@ class BrainFlowBoard:
                 f"Master board is only used for PLAYBACK_FILE_BOARD (-3) and SYNTHETIC_BOARD (-1). But {self.board_id} was provided.")
 
         board_to_use = self.master_board if self.master_board is not None else self.board_id
-        board_descr = BoardShim.get_board_descr(board_to_use)
+        board_descr = _board_descr(board_to_use)
 
-        eeg_channels = board_descr.get("eeg_channels", [])
-        sampling_rate = BoardShim.get_sampling_rate(board_to_use)
+        eeg_channels = list(board_descr.get("eeg_channels", []))  # own copy; the descriptor is shared
+        sampling_rate = _sampling_rate(board_to_use)
 
         return eeg_channels, sampling_rate
 
+    def _probe_port(self, port):
+        """
+        Checks whether a compatible BrainFlow device answers on a serial port by initializing a session.
+
+        Args:
+            port (ListPortInfo): The serial port to probe.
+
+        Returns:
+            dict: 'port', 'serial_number', and 'description' of the device if it is compatible.
+            None: If no compatible device responded on the port.
+        """
+        params = copy.copy(self.params)  # Probing must not leave self.params pointing at the last port tried
+        params.serial_port = port.device
+        try:
+            board = BoardShim(self.board_id, params)
+            board.prepare_session()
+            board.release_session()
+        except BrainFlowError:
+            return None
+
+        print(f"Compatible device found: Serial Number: {port.serial_number}, Description: {port.description}")
+        return {'port': port.device, 'serial_number': port.serial_number, 'description': port.description}
+
     def find_device_ports(self):
         """
         Finds all compatible BrainFlow devices by checking the available serial ports.
@@ -128,21 +192,9 @@ class BrainFlowBoard:
         """
         BoardShim.disable_board_logger()
         ports = serial.tools.list_ports.comports()
-        compatible_ports = []
 
-        for port in ports:
-            try:
-                self.params.serial_port = port.device
-                board = BoardShim(self.board_id, self.params)
-                board.prepare_session()
-                board.release_session()
-
-                device_info = {'port': port.device, 'serial_number': port.serial_number,
-                    'description': port.description}
-                print(f"Compatible device found: Serial Number: {port.serial_number}, Description: {port.description}")
-                compatible_ports.append(device_info)
-            except BrainFlowError:
-                continue
+        # Probes run one after another: BrainFlow serializes prepare_session internally, so threads gain nothing
+        compatible_ports = [info for info in map(self._probe_port, ports) if info is not None]
 
         if not compatible_ports:
             print(f"No compatible BrainFlow devices found.")
@@ -150,26 +202,28 @@ class BrainFlowBoard:
         BoardShim.enable_board_logger()
         return compatible_ports
 
-    def setup(self):
+    def _auto_detect_port(self):
         """
-        Prepares the session and starts the data stream from the BrainFlow board.
-
-        If no serial port is provided during initialization, this method attempts to auto-detect
-        a compatible device. Once the board is detected or provided, it prepares the session and starts streaming.
+        Sets serial_port to the first compatible device found by find_device_ports.
 
-        Raises:
-            BrainFlowError: If the board fails to prepare the session or start streaming.
+        Returns:
+            bool: True if a compatible device was found, False otherwise.
         """
-        if self.serial_port is None and self.master_board is None:
-            print("No serial port provided, attempting to auto-detect...")
-            ports_info = self.find_device_ports()
-            self.serial_port = ports_info[0]['port'] if ports_info else None
-            if not self.serial_port:
-                print("No compatible device found. Setup failed.")
-                return
-        elif self.serial_port is None and self.master_board is not None:
-            self.serial_port = ''
+        print("No serial port provided, attempting to auto-detect...")
+        ports_info = self.find_device_ports()
+        self.serial_port = ports_info[0]['port'] if ports_info else None
+        if not self.serial_port:
+            print("No compatible device found. Setup failed.")
+            return False
+        return True
+
+    def _start_session(self):
+        """
+        Prepares the session on the current serial port and starts streaming.
 
+        Returns:
+            bool: True if the board is streaming, False if BrainFlow reported an error.
+        """
         self.params.serial_port = self.serial_port
         self.board = BoardShim(self.board_id, self.params)
         try:
@@ -178,9 +232,41 @@ class BrainFlowBoard:
             self.board.start_stream(450000)
             self.streaming = True
             print(f"[{self.name}, {self.serial_port}] Board setup and streaming started successfully.")
+            # Bind once so these calls are plain instance attribute lookups
+            for method_name in self._BOARD_SHIM_METHODS:
+                setattr(self, method_name, getattr(self.board, method_name))
+            return True
         except BrainFlowError as e:
             print(f"[{self.name}, {self.serial_port}] Error setting up board: {e}")
             self.board = None
+            return False
+
+    def setup(self):
+        """
+        Prepares the session and starts the data stream from the BrainFlow board.
+
+        If no serial port is provided during initialization, this method first tries the last port this
+        board ID streamed from (see _load_last_port), and only auto-detects a compatible device if there is
+        none or it fails. Once the board is detected or provided, it prepares the session and starts streaming.
+
+        Raises:
+            BrainFlowError: If the board fails to prepare the session or start streaming.
+        """
+        port_from_cache = False
+        if self.serial_port is None and self.master_board is None:
+            self.serial_port = _load_last_port(self.board_id)
+            port_from_cache = self.serial_port is not None
+            if not port_from_cache and not self._auto_detect_port():
+                return
+        elif self.serial_port is None and self.master_board is not None:
+            self.serial_port = ''
+
+        started = self._start_session()
+        if not started and port_from_cache:
+            print(f"[{self.name}] Last known port {self.serial_port} failed.")
+            started = self._auto_detect_port() and self._start_session()
+        if started and self.master_board is None:
+            _save_last_port(self.board_id, self.serial_port)
 
     def show_params(self):
         """
@@ -201,6 +287,15 @@ class BrainFlowBoard:
         """
         return self.sampling_rate
 
+    def get_num_rows(self):
+        """
+        Retrieves the number of data rows (channels plus timestamps etc.) the board returns per sample.
+
+        Returns:
+            int: The row count from BrainFlow's board description, looked up once per board ID.
+        """
+        return _num_rows(self.master_board if self.master_board is not None else self.board_id)
+
     def is_streaming(self):
         """
         Checks if the BrainFlow board is currently streaming data.
@@ -250,6 +345,95 @@ class BrainFlowBoard:
             print("Board is not set up.")
             return None
 
+    def _flat_rows(self, out):
+        """Validates a caller-owned read buffer; returns its flat view and the board's number of data rows."""
+        if out.dtype != np.float64 or not out.flags.c_contiguous:
+            raise ValueError("out must be a C-contiguous float64 array.")
+        return out.reshape(-1), self.get_num_rows()
+
+    def get_current_board_data_into(self, out):
+        """
+        Like get_current_board_data, but BrainFlow copies the samples straight into the caller-owned buffer out
+        instead of into a freshly allocated array, so a polling loop can reuse one buffer.
+
+        Args:
+            out (numpy.ndarray): C-contiguous float64 buffer, typically np.empty((num_rows, num_samples)).
+                Up to out.size // num_rows of the most recent samples are fetched.
+
+        Returns:
+            numpy.ndarray: A (num_rows, n) view into out with the latest n samples, laid out exactly like the
+                result of get_current_board_data. It is overwritten by the next call with the same buffer.
+            None: If the board is not set up.
+
+        Raises:
+            ValueError: If out is not a C-contiguous float64 array.
+            BrainFlowError: If BrainFlow fails to read the ring buffer.
+        """
+        if self.board is None:
+            print("Board is not set up.")
+            return None
+        flat, num_rows = self._flat_rows(out)
+        res = BoardControllerDLL.get_instance().get_current_board_data(
+            flat.size // num_rows, BrainFlowPresets.DEFAULT_PRESET, flat, self._current_size, self.board.board_id,
+            self.board.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to get current data', res)
+        # BrainFlow packs the n samples it returns row-major at the front of the buffer
+        n = int(self._current_size[0])
+        return flat[:num_rows * n].reshape(num_rows, n)
+
+    def get_board_data_into(self, out):
+        """
+        Like get_current_board_data_into, but removes the samples it returns from the ring buffer, oldest first,
+        as get_board_data does. Consecutive calls therefore return consecutive, non-overlapping windows.
+
+        Args:
+            out (numpy.ndarray): C-contiguous float64 buffer, typically np.empty((num_rows, num_samples)).
+                Up to out.size // num_rows of the oldest buffered samples are fetched.
+
+        Returns:
+            numpy.ndarray: A (num_rows, n) view into out with the n samples removed from the ring buffer.
+            None: If the board is not set up.
+
+        Raises:
+            ValueError: If out is not a C-contiguous float64 array.
+            BrainFlowError: If BrainFlow fails to read the ring buffer.
+        """
+        if self.board is None:
+            print("Board is not set up.")
+            return None
+        flat, num_rows = self._flat_rows(out)
+        n = min(self.board.get_board_data_count(), flat.size // num_rows)
+        res = BoardControllerDLL.get_instance().get_board_data(
+            n, BrainFlowPresets.DEFAULT_PRESET, flat, self.board.board_id, self.board.input_json)
+        if res != BrainFlowExitCodes.STATUS_OK.value:
+            raise BrainFlowError('unable to get board data', res)
+        return flat[:num_rows * n].reshape(num_rows, n)
+
+    def wait_for_samples(self, num_samples, timeout=None, poll_interval=0.01):
+        """
+        Blocks until at least num_samples samples are waiting in the ring buffer.
+
+        BrainFlow has no blocking read, so this polls get_board_data_count every poll_interval seconds, which
+        keeps the wake-up within one poll interval of the data actually being there.
+
+        Args:
+            num_samples (int): Number of buffered samples to wait for.
+            timeout (float, optional): Maximum time to wait in seconds. Waits indefinitely if None.
+            poll_interval (float): Seconds between buffer checks. Default is 0.01.
+
+        Returns:
+            bool: True once the samples are available, False on timeout or if the board is not streaming.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.board is not None and self.streaming:
+            if self.board.get_board_data_count() >= num_samples:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return False
+
     def insert_marker(self, marker, verbose=True):
         """
         Inserts a marker into the data stream at the current time. Useful for tagging events in the data stream.
@@ -343,22 +527,200 @@ class BrainFlowBoard:
 #
 #     return band_powers
 
-import numpy as np
-from scipy.signal import welch
-from typing import Dict, Tuple, Sequence, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft, rfftfreq
+from scipy.signal import detrend as signal_detrend, get_window
+from typing import Dict, Tuple, Sequence, Optional, Union
+
+try:
+    from bci_control.bandpow_nb import band_powers_kernel, demean_window
+except ImportError:  # numba is optional; compute_band_powers falls back to the NumPy path
+    band_powers_kernel = demean_window = None
+
+try:
+    import pyfftw
+except ImportError:  # pyfftw is optional; _welch_psd falls back to scipy.fft
+    pyfftw = None
+
+try:
+    import cupy as cp
+    if not cp.cuda.is_available():
+        cp = None
+except ImportError:  # CuPy is optional; without a GPU every montage stays on the CPU path
+    cp = None
+
+# Montages with at least this many channels run the PSD and band reduction on the GPU when CuPy is available;
+# below it the host-to-device round trip costs more than the transforms
+_GPU_MIN_CHANNELS = 16
+
+
+@lru_cache(maxsize=16)
+def _band_plan(edges: Tuple[Tuple[float, float], ...], n_freqs: int, df: float,
+        dtype: np.dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Band integration plan for the uniform grid freqs = k * df, k < n_freqs, built once per band layout.
+
+    Returns (bins, weights), both read-only. bins is the (n_bands, 2) array of [k0, k1) bin ranges holding
+    exactly the frequencies lo <= f < hi of each edge pair; bands are contiguous on the sorted grid.
+    Row j of the (n_bands, n_freqs) weights matrix reproduces np.trapz(Pxx[:, k0:k1], freqs[k0:k1]) for
+    (k0, k1) = bins[j], so that Pxx @ weights.T integrates every band in one pass. The weights are built in
+    dtype, the dtype of Pxx, so a float32 PSD is not promoted to float64 by the multiply.
+    """
+    # Same values as rfftfreq: k * (1 / (n * d)) with df = 1 / (n * d)
+    bins = np.searchsorted(np.arange(n_freqs) * df, edges, side="left")
+    weights = np.zeros((len(bins), n_freqs), dtype=dtype)
+    for j, (k0, k1) in enumerate(bins):
+        if k1 - k0 < 2:
+            continue  # zero or one bin integrates to 0, same as np.trapz
+        weights[j, k0:k1] = df
+        weights[j, k0] = weights[j, k1 - 1] = df / 2.0
+    bins.flags.writeable = False
+    weights.flags.writeable = False
+    return bins, weights
+
+
+@lru_cache(maxsize=8)
+def _fftw_plan(shape: Tuple[int, ...], nfft: int, dtype: np.dtype, workers: Optional[int], thread_id: int):
+    """
+    pyfftw r2c plan along the last axis of a (..., nfft) float input, built once per shape with FFTW_MEASURE,
+    with SIMD-aligned input and output buffers that are reused on every call. workers follows the scipy.fft
+    convention: None is one thread, negative values count back from os.cpu_count().
+
+    Executing a plan overwrites both buffers, so plans are per thread (thread_id) rather than shared.
+    """
+    threads = 1 if workers is None else workers if workers > 0 else max(1, (os.cpu_count() or 1) + 1 + workers)
+    complex_dtype = np.result_type(dtype, np.complex64)
+    a = pyfftw.empty_aligned(shape[:-1] + (nfft,), dtype=dtype)
+    b = pyfftw.empty_aligned(shape[:-1] + (nfft // 2 + 1,), dtype=complex_dtype)
+    return pyfftw.FFTW(a, b, axes=(-1,), flags=("FFTW_MEASURE", "FFTW_DESTROY_INPUT"), threads=threads)
+
+
+@lru_cache(maxsize=8)
+def _welch_plan(nperseg: int, nfft: int, sf: float, dtype: np.dtype) -> Tuple[np.ndarray, float, np.ndarray]:
+    """
+    Per-(segment length, FFT length, sampling rate, dtype) constants of _welch_psd, built once instead of on
+    every call.
+
+    Returns the Hann window cast to dtype, the PSD density scale 1 / (sf * sum(window**2)), and the one-sided
+    frequency grid of the nfft-point FFT, all read-only.
+    """
+    window = get_window("hann", nperseg).astype(dtype)
+    scale = 1.0 / (sf * float(np.sum(window.astype(np.float64) ** 2)))
+    freqs = rfftfreq(nfft, 1.0 / sf)
+    window.flags.writeable = False
+    freqs.flags.writeable = False
+    return window, scale, freqs
+
+
+def _welch_psd(data: np.ndarray, sf: float, nperseg: int, noverlap: int, detrend, nfft: Optional[int] = None,
+        workers: Optional[int] = -1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-sided Welch PSD along the last axis, equivalent to
+    scipy.signal.welch(data, fs=sf, window="hann", nperseg=nperseg, noverlap=noverlap, nfft=nfft, detrend=detrend)
+    with density scaling and mean averaging.
+
+    Segments are strided views of data and all of them go through a single rfft, zero-padded to nfft
+    (default nperseg) and run on `workers` threads (see scipy.fft), with the window and scaling taken from
+    the cached _welch_plan. If pyfftw is installed the FFT runs through a cached FFTW plan instead, and the
+    detrended, windowed segments are written straight into its aligned input buffer.
+    """
+    nfft = nperseg if nfft is None else nfft
+    if nfft < nperseg:
+        raise ValueError(f"nfft must be >= the segment length ({nperseg} samples), got {nfft}.")
+    dtype = np.result_type(data.dtype, np.float32)
+    window, scale, freqs = _welch_plan(nperseg, nfft, float(sf), dtype)
+    step = nperseg - noverlap
+    segments = sliding_window_view(data, nperseg, axis=-1)[..., ::step, :]  # (n_channels, n_segments, nperseg)
+
+    if pyfftw is not None:
+        plan = _fftw_plan(segments.shape, nfft, dtype, workers, threading.get_ident())
+        work = plan.input_array[..., :nperseg]
+        plan.input_array[..., nperseg:] = 0  # FFTW_DESTROY_INPUT may have clobbered the zero padding
+    else:
+        work = np.empty(segments.shape, dtype)
+
+    # Detrend and window into the work buffer, written in place, instead of a temporary per step
+    if detrend not in ("constant", "linear", None, False):
+        raise ValueError(f"Unsupported detrend {detrend!r}; expected 'constant', 'linear' or None.")
+    if detrend == "constant" and demean_window is not None and segments.dtype == dtype:
+        # Fused demean + window, one pass per segment; the kernel takes (batch, channels, segments, nperseg)
+        demean_window(segments.reshape((-1,) + segments.shape[-3:]), window, work.reshape((-1,) + work.shape[-3:]))
+    elif detrend == "constant":
+        np.subtract(segments, segments.mean(axis=-1, keepdims=True), out=work)
+        np.multiply(work, window, out=work)
+    elif detrend == "linear":
+        np.multiply(signal_detrend(segments, type="linear", axis=-1), window, out=work)
+    else:
+        np.multiply(segments, window, out=work)
+
+    if pyfftw is not None:
+        spectrum = plan()
+    else:
+        # work is a fresh C-contiguous scratch array, so the FFT may reuse it instead of copying its input
+        spectrum = rfft(work, n=nfft, axis=-1, workers=workers, overwrite_x=True)
+    Pxx = (spectrum.real ** 2 + spectrum.imag ** 2).mean(axis=-2) * scale
+    # Fold the negative frequencies in: double everything but DC and (for even nfft) Nyquist
+    Pxx[..., 1:nfft // 2 + nfft % 2] *= 2
+    return freqs, Pxx
+
+
+@lru_cache(maxsize=8)
+def _welch_plan_gpu(nperseg: int, nfft: int, sf: float, dtype: np.dtype, n_samples: int, step: int):
+    """
+    Device-side counterpart of _welch_plan for _welch_psd_gpu, so each window does not copy its constants to
+    the GPU again.
+
+    Returns the window as a device array, the density scale, the host frequency grid and the device
+    (n_segments, nperseg) index array that gathers the overlapping segments of an n_samples-long signal.
+    """
+    window, scale, freqs = _welch_plan(nperseg, nfft, sf, dtype)
+    n_segments = (n_samples - nperseg) // step + 1
+    index = cp.arange(n_segments)[:, None] * step + cp.arange(nperseg)
+    return cp.asarray(window), scale, freqs, index
+
+
+@lru_cache(maxsize=16)
+def _band_weights_gpu(edges: Tuple[Tuple[float, float], ...], n_freqs: int, df: float, dtype: np.dtype):
+    """The weights of _band_plan as a device array, copied to the GPU once per band layout."""
+    return cp.asarray(_band_plan(edges, n_freqs, df, dtype)[1])
+
+
+def _welch_psd_gpu(data: np.ndarray, sf: float, nperseg: int, noverlap: int, detrend, nfft: Optional[int] = None):
+    """
+    CuPy version of _welch_psd for wide montages, constant or no detrending only: data is copied to the device
+    once, segments are gathered there and all go through a single cupy.fft.rfft. Returns the frequency grid on
+    the host and Pxx on the device.
+    """
+    nfft = nperseg if nfft is None else nfft
+    if nfft < nperseg:
+        raise ValueError(f"nfft must be >= the segment length ({nperseg} samples), got {nfft}.")
+    dtype = np.result_type(data.dtype, np.float32)
+    step = nperseg - noverlap
+    window, scale, freqs, index = _welch_plan_gpu(nperseg, nfft, float(sf), dtype, data.shape[-1], step)
+    segments = cp.asarray(data, dtype=dtype)[..., index]  # (..., n_channels, n_segments, nperseg)
+
+    if detrend == "constant":
+        segments -= segments.mean(axis=-1, keepdims=True)
+    segments *= window
+    spectrum = cp.fft.rfft(segments, n=nfft, axis=-1)
+    Pxx = (spectrum.real ** 2 + spectrum.imag ** 2).mean(axis=-2) * scale
+    Pxx[..., 1:nfft // 2 + nfft % 2] *= 2
+    return freqs, Pxx
 
 
 def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[float, float]] = None,
         window_sec: Optional[float] = None, overlap: float = 0.5, detrend: str = "constant", relative: bool = False,
-        return_log: bool = False, total_band: Optional[Tuple[float, float]] = None, ) -> Tuple[
-    np.ndarray, Sequence[str]]:
+        return_log: bool = False, total_band: Optional[Tuple[float, float]] = None, nfft: Optional[int] = None,
+        workers: Optional[int] = -1, return_labels: bool = True, ) -> Union[
+    Tuple[np.ndarray, Sequence[str]], np.ndarray]:
     """
     Compute bandpowers for data of shape (n_channels, n_samples).
 
     Parameters
     ----------
     data : np.ndarray
-        EEG/MEG/LFP data, shape (n_channels, n_samples).
+        EEG/MEG/LFP data, shape (n_channels, n_samples); leading axes, e.g. (n_windows, n_channels,
+        n_samples), are treated as a batch and processed in one pass.
     sf : float
         Sampling frequency in Hz.
     bands : dict[str, (float, float)], optional
@@ -379,14 +741,21 @@ def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[floa
     total_band : (float, float) | None
         Frequency range for the denominator when `relative=True`.
         If None and `relative=True`, uses [0, sf/2).
+    nfft : int, optional
+        FFT length per Welch segment; segments are zero-padded up to it (e.g. 512 for a
+        500-sample window). Default: the segment length.
+    workers : int, optional
+        Threads for the FFT, as in scipy.fft. Default -1 (all cores). Not used on the GPU path.
+    return_labels : bool
+        If False, return only `bp` instead of the `(bp, labels)` tuple.
 
     Returns
     -------
     bp : np.ndarray
-        Bandpowers, shape (n_channels, n_bands), in V^2 if absolute or unitless if relative.
+        Bandpowers averaged over channels, shape (..., n_bands), in V^2 if absolute or unitless if relative.
         If return_log=True, units are dB.
     labels : list[str]
-        Band labels in the same order as columns of `bp`.
+        Band labels in the same order as `bp`. Only returned if return_labels=True.
 
     Notes
     -----
@@ -394,10 +763,12 @@ def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[floa
     - Integration uses the trapezoidal rule over the PSD.
     - If a band has no frequency bins (e.g., too narrow vs. resolution),
       the power for that band is set to 0.
+    - With CuPy and a CUDA device, montages of at least 16 channels (constant or no detrending) compute the
+      PSD and band integration on the GPU; only the band powers are copied back.
     """
     # if data.ndim != 2:
     #     raise ValueError("`data` must be 2D with shape (n_channels, n_samples).")
-    n_channels, n_samples = data.shape
+    n_samples = data.shape[-1]
 
     if bands is None:
         bands = {"delta": (1.0, 4.0), "theta": (4.0, 8.0), "alpha": (8.0, 13.0), "beta": (13.0, 30.0),
@@ -412,23 +783,20 @@ def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[floa
     noverlap = int(round(nperseg * overlap)) if 0 <= overlap < 1 else 0
 
     # Compute PSD: Pxx units are V^2/Hz if input is in volts
-    freqs, Pxx = welch(data, fs=sf, nperseg=nperseg, noverlap=noverlap, detrend=detrend, axis=-1, return_onesided=True,
-        scaling="density", average="mean", )
-    # Pxx shape: (n_channels, n_freqs)
-    # Integrate PSD over each band
+    use_gpu = cp is not None and data.shape[-2] >= _GPU_MIN_CHANNELS and detrend in ("constant", None, False)
+    if use_gpu:
+        freqs, Pxx = _welch_psd_gpu(data, sf, nperseg, noverlap, detrend, nfft=nfft)
+    else:
+        freqs, Pxx = _welch_psd(data, sf, nperseg, noverlap, detrend, nfft=nfft, workers=workers)
+    # Pxx shape: (..., n_channels, n_freqs)
+    # Integrate PSD over each band, and the total band if needed
     labels = list(bands.keys())
-    bp = np.zeros((n_channels, len(labels)), dtype=float)
-
-    for j, (lo, hi) in enumerate(bands.values()):
+    edges = []
+    for label, (lo, hi) in bands.items():
         if hi <= lo:
-            raise ValueError(f"Invalid band {labels[j]} with lo>=hi: {(lo, hi)}")
-        idx = np.logical_and(freqs >= lo, freqs < hi)
-        if not np.any(idx):
-            bp[:, j] = 0.0
-        else:
-            bp[:, j] = np.trapz(Pxx[:, idx], freqs[idx], axis=-1)
+            raise ValueError(f"Invalid band {label} with lo>=hi: {(lo, hi)}")
+        edges.append((float(lo), float(hi)))
 
-    # Relative power normalization if requested
     if relative:
         if total_band is None:
             lo_tot, hi_tot = (0.0, sf / 2.0 - 1e-12)  # upper open interval
@@ -436,19 +804,42 @@ def compute_band_powers(data: np.ndarray, sf: float, bands: Dict[str, Tuple[floa
             lo_tot, hi_tot = total_band
             if hi_tot <= lo_tot:
                 raise ValueError(f"Invalid total_band with lo>=hi: {total_band}")
-        idx_tot = np.logical_and(freqs >= lo_tot, freqs < hi_tot)
-        if not np.any(idx_tot):
-            raise ValueError("total_band does not include any frequency bins; increase window length or adjust band.")
-        total_power = np.trapz(Pxx[:, idx_tot], freqs[idx_tot], axis=-1)  # (n_channels,)
+        edges.append((float(lo_tot), float(hi_tot)))
+
+    # Bin ranges and weights only depend on the band layout and the frequency grid, so they are cached
+    bins, weights = _band_plan(tuple(edges), len(freqs), float(freqs[1] - freqs[0]), Pxx.dtype)
+    # bins: (n_bands [+ 1], 2), weights: (n_bands [+ 1], n_freqs)
+    if relative and bins[-1, 1] <= bins[-1, 0]:
+        raise ValueError("total_band does not include any frequency bins; increase window length or adjust band.")
+
+    if use_gpu:
+        # Integrate on the device so only the (..., n_channels, n_bands [+ 1]) result crosses back to the host
+        weights = _band_weights_gpu(tuple(edges), len(freqs), float(freqs[1] - freqs[0]), Pxx.dtype)
+        bp = cp.asnumpy(Pxx @ weights.T)
+    elif band_powers_kernel is not None:
+        # Integration, normalization, log and the channel mean in one compiled pass
+        psd = Pxx.reshape((-1,) + Pxx.shape[-2:])
+        bp = np.empty((psd.shape[0], len(labels)), dtype=Pxx.dtype)
+        band_powers_kernel(freqs, psd, bins, bool(relative), bool(return_log), float(np.finfo(Pxx.dtype).tiny), bp)
+        bp = bp.reshape(Pxx.shape[:-2] + (len(labels),))
+        return (bp, labels) if return_labels else bp
+    else:
+        bp = Pxx @ weights.T
+    # bp shape: (..., n_channels, n_bands [+ 1 for the total band])
+
+    # Relative power normalization if requested
+    if relative:
+        bp, total_power = bp[..., :-1], bp[..., -1]  # total_power: (..., n_channels)
         # Avoid divide by zero
         total_power = np.where(total_power <= 0, np.nan, total_power)
-        bp = bp / total_power[:, None]
+        bp = bp / total_power[..., None]
 
     if return_log:
         # 10*log10(power). Guard against log(0).
-        bp = 10.0 * np.log10(np.maximum(bp, np.finfo(float).tiny))
+        bp = 10 * np.log10(np.maximum(bp, np.finfo(bp.dtype).tiny))
 
-    return bp.mean(axis=0), labels
+    bp = bp.mean(axis=-2)
+    return (bp, labels) if return_labels else bp
 
 #######
 # Example streaming from a single board
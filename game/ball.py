@@ -17,17 +17,49 @@ class Ball(GameObject):
         super().__init__(x - radius, y - radius, radius * 2, radius * 2, color)
         self.radius = radius
         self.speed = speed
+        # Set by increase_speed/decrease_speed (BCI thread); update() applies it on the render thread, which
+        # owns direction and the cached velocity
+        self._speed_changed = False
+        # Pre-rendered sprite, so the ball can go out in the same screen.blits call as the bricks
+        self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.ellipse(self.image, color, self.image.get_rect())
         self.direction = random.uniform(-math.pi * 0.75, -math.pi * 0.25)
 
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, value):
+        # Velocity only changes here and on wall flips, so update() needs no trig per frame
+        self._direction = value
+        self._update_velocity()
+
+    def _update_velocity(self):
+        self.vx = self.speed * math.cos(self._direction)
+        self.vy = self.speed * math.sin(self._direction)
+
     def update(self):
-        self.rect.x += self.speed * math.cos(self.direction)
-        self.rect.y += self.speed * math.sin(self.direction)
+        if self._speed_changed:
+            self._speed_changed = False
+            self._update_velocity()
+        self.rect.x += self.vx
+        self.rect.y += self.vy
+        x, y = self.rect.x, self.rect.y
+        max_x = SCREEN_WIDTH - self.rect.width
 
-        if self.rect.left <= 0 or self.rect.right >= SCREEN_WIDTH:
-            self.direction = math.pi - self.direction
-        if self.rect.top <= 0:
-            self.direction = -self.direction
+        # Branchless wall bounce: the hit flags are 0/1 and scale the flip instead of guarding it.
+        # pi - direction and -direction are exact axis flips of the velocity.
+        hit_x = (x <= 0) | (x >= max_x)
+        hit_y = y <= 0
+        self.vx -= 2 * self.vx * hit_x
+        self.vy -= 2 * self.vy * hit_y
+        self._direction += hit_x * (math.pi - 2 * self._direction)
+        self._direction -= 2 * self._direction * hit_y
 
+        # Clamp back inside the walls so a fast ball cannot stay past one and bounce again next frame
+        self.rect.x = min(max(x, 0), max_x)
+        self.rect.y = max(y, 0)
 
     def bounce(self):
         reflection = -self.direction
@@ -37,15 +69,17 @@ class Ball(GameObject):
             self.direction += 0.1
 
     def draw(self, screen):
-        pygame.draw.ellipse(screen, self.color, self.rect)
+        screen.blit(self.image, self.rect)
 
     def increase_speed(self):
         if self.speed <= MAX_BALL_SPEED:
             self.speed += 1
+            self._speed_changed = True
             print(f"Speed increased to {self.speed}")
     def decrease_speed(self):
         if self.speed >= MIN_BALL_SPEED:
             self.speed -= 1
+            self._speed_changed = True
             print(f"Speed decreased to {self.speed}")
 
     def light_force(self):
@@ -8,15 +8,16 @@ class Brick(GameObject):
         self.intensity = intensity
         self.max_intensity = intensity if intensity > 0 else 1
         self.original_color = color
+        # Darkened color for every remaining intensity, so a hit is a single lookup
+        self._color_lut = [
+            tuple(int(c * (0.5 + 0.5 * (i / self.max_intensity))) for c in color)
+            for i in range(self.max_intensity + 1)
+        ]
 
     def hit(self, factor:int = 1):
         self.intensity -= factor
         if self.intensity <= 0:
             return True
         else:
-            factor = 0.5 + 0.5 * (self.intensity / self.max_intensity)
-            r = int(self.original_color[0] * factor)
-            g = int(self.original_color[1] * factor)
-            b = int(self.original_color[2] * factor)
-            self.color = (r, g, b)
+            self.color = self._color_lut[self.intensity]
             return False
@@ -11,3 +11,8 @@ PADDLE_HEIGHT = 50
 PADDLE_V_ANGLE = math.radians(0)
 
 VIBGYOR = [(0, 255, 0),(0, 255, 0),(0, 255, 0),(0, 255, 0), (255, 255, 0), (255, 127, 0), (255, 0, 0)]
+
+BRICK_WIDTH = 75
+BRICK_HEIGHT = 20
+BRICK_GAP = 5
+BRICK_TOP = 50
@@ -13,10 +13,23 @@ from game.constants import *
 from game.paddle import Paddle
 
 
+# The window contents were lost or uncovered, so the next frame has to repaint the whole screen
+_REDRAW_EVENTS = (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE)
+
+# Adaptive BCI cadence, see _bci_processing_loop
+BCI_INTERVAL = 5  # seconds between ticks while the signal is changing
+BCI_MAX_INTERVAL = 10  # longest back-off while it is stable
+STABLE_VAR_TOLERANCE = 0.01  # relative variance change that still counts as stable
+MAX_STABLE_SKIPS = 3  # stable ticks in a row that skip the band powers before a recompute is forced
+
+
 class Game:
     def __init__(self):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Only queue the events _handle_events acts on, so mouse motion etc. never allocates Event objects
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.MOUSEBUTTONDOWN, *_REDRAW_EVENTS])
         self.clock = pygame.time.Clock()
 
         self.font = pygame.font.Font(None, 36)
@@ -27,19 +40,36 @@ class Game:
         self.start_time = pygame.time.get_ticks()
         self.final_time = 0
         self.best_time = self._load_best_time()
-
+        # Value currently in best_time.txt, so an unchanged best time is never rewritten
+        self._saved_best_time = self.best_time
+        # (elapsed seconds, rendered surface) of the HUD timer; re-rendered only when the second changes
+        self._timer_cache = (-1, None)
+        self._timer_rect = pygame.Rect(SCREEN_WIDTH - 10, 10, 0, 0)
+        # (surface, rect) pairs for the end screen text, rendered once when the game ends
+        self._end_screen_text = []
+        # The translucent end-screen overlay never changes, so it is built once
+        self._end_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self._end_overlay.fill((0, 0, 0, 180))
+
+        # The baseline is computed from the collector's own ring buffers once this time is reached
         self.calibration_end_time = self.start_time + 15000
-        self.calibration_data_a = []
-        self.calibration_data_b = []
         self.calibrated_ratio = 0.0
 
         self.game_ratio = 0.0
         self.previous_game_ratio = 0.0
 
+        # Preallocated read targets for the BCI thread, so polling the collector doesn't allocate
+        self._eeg_buf = np.empty((2, 3200), dtype=np.float32)
+        self._dc_out = np.empty((2, 3200), dtype=np.float32)
+        self._mean_buf = np.empty((2, 1), dtype=np.float32)
+
         # --- Threading variables ---
         self.collector = None
         self.bci_thread = None
         self.bci_thread_stop_event = threading.Event()
+        # Adaptive BCI cadence: ticks skipped in a row, and the signal variance at the last recompute
+        self._stable_cycles = 0
+        self._ref_signal_var = None
 
         self.setup_objects()
 
@@ -47,23 +77,59 @@ class Game:
         self.paddle = Paddle(SCREEN_HEIGHT - 40, SCREEN_WIDTH, PADDLE_HEIGHT, WHITE)
         self.ball = Ball(SCREEN_WIDTH // 2, self.paddle.rect.top - 10, 10, WHITE, speed=START_SPEED)
         self.bricks = self._create_bricks()
+        # Dirty-rect rendering state for _draw: regions to repaint next frame, and where the ball was drawn
+        self._needs_full_redraw = True
+        self._dirty_rects = []
+        self._prev_ball_rect = self.ball.rect.copy()
+        # One pre-filled brick-sized surface per brick color (including the darkened hit colors), so all
+        # bricks go out in a single screen.blits call
+        self._brick_surfs = {}
 
     def _create_bricks(self):
         bricks = []
         rows, cols = len(VIBGYOR), 10
-        brick_width, brick_height = 75, 20
-        gap = 5
         for row in range(rows):
             for col in range(cols):
                 intensity = (rows - 1) - row
                 color = VIBGYOR[row]
-                brick_x = col * (brick_width + gap) + (gap * 4)
-                brick_y = row * (brick_height + gap) + 50
-                bricks.append(Brick(brick_x, brick_y, brick_width, brick_height, color, intensity))
+                brick_x = col * (BRICK_WIDTH + BRICK_GAP) + (BRICK_GAP * 4)
+                brick_y = row * (BRICK_HEIGHT + BRICK_GAP) + BRICK_TOP
+                bricks.append(Brick(brick_x, brick_y, BRICK_WIDTH, BRICK_HEIGHT, color, intensity))
+
+        # Collision state as parallel arrays in grid order: x1, y1, x2, y2 per brick plus an alive mask,
+        # so each grid row is one contiguous slice of cols entries. self.bricks keeps every brick in the
+        # same order; destroyed ones are only marked dead, and _bricks_left counts the live ones
+        self._brick_cols = cols
+        self._bricks_left = len(bricks)
+        self._brick_xyxy = np.array([(b.rect.left, b.rect.top, b.rect.right, b.rect.bottom) for b in bricks],
+                                    dtype=np.int32)
+        self._brick_alive = np.ones(len(bricks), dtype=bool)
         return bricks
 
-    def remove_dc_offset(self, data):
-        return np.array(data) - np.mean(data)
+    def _find_hit_brick(self):
+        """Returns the self.bricks index of the first live brick the ball overlaps, or None."""
+        rect = self.ball.rect
+        pitch = BRICK_HEIGHT + BRICK_GAP
+        n_rows = len(self._brick_alive) // self._brick_cols
+        first_row = max((rect.top - BRICK_TOP) // pitch, 0)
+        last_row = min((rect.bottom - 1 - BRICK_TOP) // pitch, n_rows - 1)
+        if first_row > last_row:
+            return None
+        lo, hi = first_row * self._brick_cols, (last_row + 1) * self._brick_cols
+        xyxy = self._brick_xyxy[lo:hi]
+        hits = ((xyxy[:, 0] < rect.right) & (xyxy[:, 2] > rect.left) &
+                (xyxy[:, 1] < rect.bottom) & (xyxy[:, 3] > rect.top) & self._brick_alive[lo:hi])
+        index = np.flatnonzero(hits)[:1]
+        return lo + int(index[0]) if index.size else None
+
+    def remove_dc_offset(self, data, out=None):
+        """
+        Subtracts each channel's own mean along the sample axis; with out given, runs entirely in
+        preallocated buffers. float32 arrays (all the collector produces) are used without a copy.
+        """
+        data = np.asarray(data, dtype=np.float32)
+        mean = np.mean(data, axis=-1, keepdims=True, out=self._mean_buf if out is not None else None)
+        return np.subtract(data, mean, out=out)
 
     def run(self):
         self.running = True
@@ -99,19 +165,13 @@ class Game:
 
     def _run_calibration_step(self):
         """Handles logic for the 30-second calibration phase."""
-        data = self.collector.get_current_data(num_samples=500)
-        if data and data[0] and data[1]:
-            self.calibration_data_a.extend(data[0])
-            self.calibration_data_b.extend(data[1])
-
         self._draw_calibration_screen()
 
         if pygame.time.get_ticks() >= self.calibration_end_time:
-            self._compute_calibration_results()
             self.state = 'playing'
             self.start_time = pygame.time.get_ticks()
 
-            # --- Start the asynchronous BCI processing thread ---
+            # --- Start the asynchronous BCI processing thread (it computes the baseline first) ---
             self.bci_thread_stop_event.clear()
             self.bci_thread = threading.Thread(target=self._bci_processing_loop, daemon=True)
             self.bci_thread.start()
@@ -119,19 +179,35 @@ class Game:
     def _bci_processing_loop(self):
         """
         Runs in a separate thread. This is the logic from the old _run_game_step,
-        now running asynchronously every 5 seconds.
+        now running asynchronously every BCI_INTERVAL seconds. While the signal variance stays within
+        STABLE_VAR_TOLERANCE of its value at the last recompute, the band powers are not recomputed and
+        the interval backs off to BCI_MAX_INTERVAL, but never for more than MAX_STABLE_SKIPS ticks in a row.
+        A flat signal (zero variance) never counts as stable.
         """
         print("BCI processing thread started.")
+        self._compute_calibration_results()
         while not self.bci_thread_stop_event.is_set():
             sampling_rate = 256
-            data = self.collector.get_current_data(num_samples=3200)
+            recent = self.collector.get_current_data(num_samples=512)[0]
+            signal_var = float(np.var(recent)) if len(recent) else None
+            ref_var = self._ref_signal_var
+            stable = (signal_var is not None and ref_var is not None and ref_var > 0
+                      and abs(signal_var - ref_var) <= STABLE_VAR_TOLERANCE * ref_var)
+
+            n = 0
+            if stable and self._stable_cycles < MAX_STABLE_SKIPS:
+                self._stable_cycles += 1
+            else:
+                self._stable_cycles = 0
+                self._ref_signal_var = signal_var
+                data = self.collector.get_current_data(num_samples=3200, out=self._eeg_buf)
+                n = min(len(data[0]), len(data[1]))
 
-            if data and data[0]:
+            if n:
                 try:
                     # NOTE: Assuming you want to process the first channel (data[0])
-                    eeg_data = self.remove_dc_offset(data)
-                    band_powers = compute_band_powers(eeg_data, sampling_rate, relative=True)
-                    powers, _ = band_powers
+                    eeg_data = self.remove_dc_offset(self._eeg_buf[:, :n], out=self._dc_out[:, :n])
+                    powers = compute_band_powers(eeg_data, sampling_rate, relative=True, return_labels=False)
 
                     if powers[3] > 0:
                         self.game_ratio = powers[3] / powers[2]
@@ -149,15 +225,20 @@ class Game:
 
             self.previous_game_ratio = self.game_ratio
 
-            # Wait for 5 seconds before the next computation
-            time.sleep(5)
+            # Wait before the next computation, longer while the signal is stable
+            self.bci_thread_stop_event.wait(min(BCI_MAX_INTERVAL, BCI_INTERVAL * 2 ** self._stable_cycles))
 
         print("BCI processing thread stopped.")
 
     def _compute_calibration_results(self):
-        """Processes all collected calibration data to find the baseline ratio."""
+        """
+        Computes the baseline ratio from the last 3200 samples the collector received during calibration.
+        Runs on the BCI thread.
+        """
         print("Calibration finished. Computing baseline...")
-        if not self.calibration_data_a:
+        data = self.collector.get_current_data(num_samples=3200, out=self._eeg_buf)
+        n = min(len(data[0]), len(data[1]))
+        if not n:
             print("Warning: No data collected during calibration. Using a default ratio.")
             self.calibrated_ratio = 0.4
             return
@@ -165,14 +246,10 @@ class Game:
         try:
             sampling_rate = 256
             # NOTE: Using both channels for calibration as in original code
-            eeg_data = self.remove_dc_offset([self.calibration_data_a[-3200:], self.calibration_data_b[-3200:]])
-            band_powers = compute_band_powers(eeg_data, sampling_rate, relative=True)
-            powers, _ = band_powers
+            eeg_data = self.remove_dc_offset(self._eeg_buf[:, :n], out=self._dc_out[:, :n])
+            powers = compute_band_powers(eeg_data, sampling_rate, relative=True, return_labels=False)
 
-            if powers[3] > 0:
-                self.calibrated_ratio = powers[3] / powers[2]
-            else:
-                self.calibrated_ratio = 1.0
+            self.calibrated_ratio = powers[3] / powers[2] if powers[3] > 0 else 1.0
 
             print(f"Calibration successful. Baseline Alpha/Beta Ratio: {self.calibrated_ratio:.4f}")
         except Exception as e:
@@ -192,10 +269,11 @@ class Game:
         pygame.display.flip()
 
     def _handle_events(self):
-        # This method is unchanged
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type in _REDRAW_EVENTS:
+                self._needs_full_redraw = True
             if self.state == 'playing':
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     self.ball.light_force()
@@ -206,41 +284,84 @@ class Game:
         self._handle_collisions()
 
     def _handle_collisions(self):
-        # This method is unchanged
         if self.ball.rect.colliderect(self.paddle.rect):
             self.ball.bounce()
             self.ball.rect.bottom = self.paddle.rect.top
-        hit_brick = next((b for b in self.bricks if self.ball.rect.colliderect(b.rect)), None)
-        if hit_brick:
+        index = self._find_hit_brick()
+        if index is not None:
+            hit_brick = self.bricks[index]
             self.ball.bounce()
+            self._dirty_rects.append(hit_brick.rect)
             if hit_brick.hit(factor=self.ball.speed % len(VIBGYOR)):
-                self.bricks.remove(hit_brick)
+                self._brick_alive[index] = False
+                self._bricks_left -= 1
         if self.ball.rect.bottom >= SCREEN_HEIGHT:
             if self.state == 'playing':
                 self.state = 'game_over'
                 self._handle_game_end()
-        if not self.bricks:
+        if not self._bricks_left:
             if self.state == 'playing':
                 self.state = 'win'
                 self._handle_game_end()
 
+    def _brick_surface(self, color):
+        surf = self._brick_surfs.get(color)
+        if surf is None:
+            surf = pygame.Surface((BRICK_WIDTH, BRICK_HEIGHT))
+            surf.fill(color)
+            self._brick_surfs[color] = surf
+        return surf
+
     def _draw(self):
-        # This method is unchanged
-        self.screen.fill(BLACK)
-        self.paddle.draw(self.screen)
-        self.ball.draw(self.screen)
-        for brick in self.bricks:
-            brick.draw(self.screen)
-        self._draw_timer()
-        pygame.display.flip()
+        """
+        Dirty-rect rendering: after one full frame, only the regions that changed (the ball's old and
+        new position, hit bricks, the timer) are repainted and pushed with display.update.
+        """
+        timer_rect = self._timer_rect
+        timer_changed = self._update_timer_text()
+        if self._needs_full_redraw:
+            self._needs_full_redraw = False
+            self._dirty_rects = []
+            self._redraw_region(self.screen.get_rect())
+            pygame.display.flip()
+        else:
+            dirty = self._dirty_rects
+            self._dirty_rects = []
+            dirty.append(self._prev_ball_rect.union(self.ball.rect))
+            if timer_changed:
+                dirty.append(timer_rect.union(self._timer_rect))
+            for rect in dirty:
+                self._redraw_region(rect)
+            pygame.display.update(dirty)
+        self._prev_ball_rect = self.ball.rect.copy()
         self.clock.tick(FPS)
 
-    def _draw_timer(self):
-        # This method is unchanged
+    def _redraw_region(self, rect):
+        """Repaints everything inside rect, in the same order as a full frame."""
+        screen = self.screen
+        screen.set_clip(rect)
+        screen.fill(BLACK)
+        xyxy = self._brick_xyxy
+        visible = (self._brick_alive & (xyxy[:, 0] < rect.right) & (xyxy[:, 2] > rect.left) &
+                   (xyxy[:, 1] < rect.bottom) & (xyxy[:, 3] > rect.top))
+        bricks = self.bricks
+        # Paddle, ball, bricks and timer as pre-rendered surfaces in one blits call
+        sprites = [(self.paddle.image, self.paddle.rect.topleft), (self.ball.image, self.ball.rect)]
+        sprites += [(self._brick_surface(bricks[i].color), bricks[i].rect) for i in np.flatnonzero(visible).tolist()]
+        sprites.append((self._timer_cache[1], self._timer_rect))
+        screen.blits(sprites, doreturn=False)
+        screen.set_clip(None)
+
+    def _update_timer_text(self):
+        """Re-renders the HUD timer when the elapsed second changes; returns True if it did."""
         elapsed_time = (pygame.time.get_ticks() - self.start_time) // 1000
+        if elapsed_time == self._timer_cache[0]:
+            return False
         minute, sec = divmod(elapsed_time, 60)
         timer_text = self.font.render(f"Time: {minute:02d}:{sec:02d}", True, WHITE)
-        self.screen.blit(timer_text, timer_text.get_rect(topright=(SCREEN_WIDTH - 10, 10)))
+        self._timer_cache = (elapsed_time, timer_text)
+        self._timer_rect = timer_text.get_rect(topright=(SCREEN_WIDTH - 10, 10))
+        return True
 
     def _handle_game_end(self):
         # Signal the BCI thread to stop as soon as the game ends
@@ -250,24 +371,23 @@ class Game:
         if self.best_time == 0 or (self.final_time < self.best_time and self.state == 'win'):
             self.best_time = self.final_time
             self._save_best_time(self.best_time)
+        self._render_end_screen_text()
 
-    def _draw_end_screen(self):
-        # This method is unchanged
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+    def _render_end_screen_text(self):
         message = "Game Over" if self.state == 'game_over' else "You Win!"
         text_surf = self.large_font.render(message, True, WHITE)
-        text_rect = text_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 50))
-        self.screen.blit(text_surf, text_rect)
+        self._end_screen_text = [(text_surf, text_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 50)))]
         time_surf = self.font.render(f"Your Time: {self.final_time // 60:02d}:{self.final_time % 60:02d}", True, WHITE)
-        time_rect = time_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 20))
-        self.screen.blit(time_surf, time_rect)
+        self._end_screen_text.append((time_surf, time_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 20))))
         if self.best_time > 0:
             best_time_surf = self.font.render(f"Best Time: {self.best_time // 60:02d}:{self.best_time % 60:02d}", True,
                                               WHITE)
             best_time_rect = best_time_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 60))
-            self.screen.blit(best_time_surf, best_time_rect)
+            self._end_screen_text.append((best_time_surf, best_time_rect))
+
+    def _draw_end_screen(self):
+        self.screen.blit(self._end_overlay, (0, 0))
+        self.screen.blits(self._end_screen_text, doreturn=False)
         pygame.display.flip()
 
     def _load_best_time(self):
@@ -279,9 +399,11 @@ class Game:
             return 0
 
     def _save_best_time(self, time):
-        # This method is unchanged
+        if time == self._saved_best_time:
+            return
         with open("best_time.txt", "w") as f:
             f.write(str(time))
+        self._saved_best_time = time
 
     def _cleanup(self):
         # This method is unchanged
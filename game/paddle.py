@@ -9,6 +9,11 @@ class Paddle(GameObject):
         super().__init__(0, y_position, width, height, color)
 
         self.points = self._calculate_v_points()
+        # Pre-rendered sprite at self.rect.topleft; the polygon's right and bottom edges sit on rect.right /
+        # rect.bottom, one pixel past the rect, so the surface is one pixel larger each way
+        self.image = pygame.Surface((self.rect.width + 1, self.rect.height + 1), pygame.SRCALPHA)
+        left, top = self.rect.topleft
+        pygame.draw.polygon(self.image, color, [(x - left, y - top) for x, y in self.points])
 
     def _calculate_v_points(self):
         top_y = self.rect.top
@@ -17,18 +22,8 @@ class Paddle(GameObject):
 
         dip_y = self.rect.top + self.rect.height
 
-        points = [(self.rect.left, top_y), (self.rect.right, top_y), (self.rect.right, bottom_y),
-                  (self.rect.left, bottom_y), (center_x, dip_y)]
-
-        points = [(self.rect.left, top_y), (self.rect.right, top_y), (self.rect.right, dip_y - self.rect.height / 2),
-                  (center_x, dip_y), (self.rect.left, dip_y - self.rect.height / 2)]
-
-        points = [(self.rect.left, top_y), (self.rect.right, top_y), (self.rect.right, bottom_y),
-                  (self.rect.left, bottom_y), (center_x, top_y)]
-
-        points = [(self.rect.left, top_y), (center_x, dip_y), (self.rect.right, top_y), (self.rect.right, bottom_y),
-                  (self.rect.left, bottom_y)]
-        return points
+        return ((self.rect.left, top_y), (center_x, dip_y), (self.rect.right, top_y), (self.rect.right, bottom_y),
+                (self.rect.left, bottom_y))
 
     def draw(self, screen):
-        pygame.draw.polygon(screen, self.color, self.points)
+        screen.blit(self.image, self.rect.topleft)
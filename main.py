@@ -1,12 +1,58 @@
-import time
+import queue
+import threading
 
 import numpy as np
-from brainflow import LogLevels, DataFilter
+from numpy.lib.stride_tricks import sliding_window_view
+from brainflow import LogLevels
 from brainflow.board_shim import BoardIds, BoardShim
+from scipy.signal import lfilter, lfilter_zi
 
 from bci_control.brainflow_stream import BrainFlowBoard, compute_band_powers
 from game.game import Game
 
+# Single-pole IIR DC blocker: y[n] = x[n] - x[n-1] + 0.995 * y[n-1]
+DC_BLOCKER_B = np.array([1.0, -1.0], dtype=np.float32)
+DC_BLOCKER_A = np.array([1.0, -0.995], dtype=np.float32)
+
+# Per-hop debug logging from the acquisition thread; off by default to keep the Python/C crossing out of the loop
+VERBOSE = False
+
+
+def remove_dc_offset(data, zi=None, eeg_buf=None):
+    """
+    Runs the DC blocker over the EEG rows of data and returns (eeg, zi).
+
+    Pass the returned zi back in on the next call so the filter stays continuous across windows; with zi=None
+    the state starts at steady state for each channel's first sample, so there is no start-up transient.
+    EEG rows are processed as float32: the ADC is 24-bit, so float64 only doubles the work downstream. If
+    eeg_buf, a float32 (3, >= n_samples) array, is given the rows are converted into it instead of a new array.
+    """
+    rows = data[1:4, :]
+    if eeg_buf is None:
+        eeg = rows.astype(np.float32)
+    else:
+        eeg = eeg_buf[:, :rows.shape[1]]
+        np.copyto(eeg, rows, casting='same_kind')
+    if zi is None:
+        zi = (lfilter_zi(DC_BLOCKER_B, DC_BLOCKER_A)[None, :] * eeg[:, :1]).astype(np.float32)
+    return lfilter(DC_BLOCKER_B, DC_BLOCKER_A, eeg, axis=1, zi=zi)
+
+
+def acquire_windows(board, hop_size, free_buffers, windows, stop_event):
+    """
+    Producer thread for main(): whenever at least hop_size new samples are available, reads them (up to the
+    buffer's capacity) into a buffer taken from free_buffers and queues it on windows as a (buffer, data) pair,
+    until stop_event is set or the board stops streaming.
+    """
+    while not stop_event.is_set() and board.is_streaming():
+        if VERBOSE:
+            BoardShim.log_message(LogLevels.LEVEL_INFO.value, 'waiting for the next hop in the acquisition thread')
+        # Wake up as soon as a hop has arrived and consume everything pending, so no sample is read twice
+        if not board.wait_for_samples(hop_size, timeout=0.5):
+            continue
+        buf = free_buffers.get()
+        windows.put((buf, board.get_board_data_into(buf)))
+
 
 def main():
     increasing = False
@@ -14,30 +60,74 @@ def main():
     board_id = BoardIds.CYTON_BOARD.value
     board = BrainFlowBoard(board_id=board_id, serial_port="/dev/cu.usbserial-DM01IK21")
     board.setup()
-    board_descr = BoardShim.get_board_descr(board_id)
-    sampling_rate = int(board_descr['sampling_rate'])
-
-    while True:
-        BoardShim.log_message(LogLevels.LEVEL_INFO.value, 'start sleeping in the main thread')
-        time.sleep(2)
-        nfft = DataFilter.get_nearest_power_of_two(sampling_rate)
-        data = board.get_current_board_data(num_samples=500)
-
-        eeg_data = data
-
-        def remove_dc_offset(data):
-            return data[1:4, :] - np.mean(data[1:4, :], axis=1, keepdims=True)
-
-        eeg_data = remove_dc_offset(eeg_data)
-        band_powers = compute_band_powers(eeg_data, sampling_rate, relative=True)
-        powers, _ = band_powers
-
-        ratio = powers[3] / powers[2]
-        if ratio > max_ratio:
-            max_ratio = ratio
-            increasing = True
-        else:
-            increasing = False
+    # Static board metadata, looked up once: BrainFlowBoard already fetched it (through its per-board cache)
+    sampling_rate = board.get_sampling_rate()
+
+    # Sliding 2 s windows, one every hop_size samples. The filtered EEG of the last history_len samples is kept
+    # in a preallocated ring; every window that completed since the previous chunk is taken from it as a
+    # strided view and all of them go through compute_band_powers in a single batched call.
+    window_size = 500
+    hop_size = 100
+    max_chunk = 5 * window_size
+    history_len = window_size + max_chunk
+    # The epoch shape is fixed for the session, so build its FFT plan, window and band tables on this thread
+    # before streaming starts; with pyfftw the FFTW_MEASURE planning alone would otherwise add ~70 ms to the
+    # first window
+    compute_band_powers(np.zeros((1, 3, window_size), dtype=np.float32), sampling_rate, relative=True,
+                        return_labels=False)
+    # Double buffering: the acquisition thread fills one chunk buffer while this thread processes the other
+    num_rows = board.get_num_rows()
+    free_buffers = queue.Queue()
+    for _ in range(2):
+        free_buffers.put(np.empty((num_rows, max_chunk)))
+    windows = queue.Queue(maxsize=2)
+    stop_event = threading.Event()
+    acquisition = threading.Thread(target=acquire_windows,
+                                   args=(board, hop_size, free_buffers, windows, stop_event), daemon=True)
+    acquisition.start()
+    eeg_buf = np.empty((3, max_chunk), dtype=np.float32)
+    history = np.zeros((3, history_len), dtype=np.float32)
+    filled = 0  # valid samples at the end of history
+    pending = 0  # samples received since the end of the last processed window
+    dc_zi = None
+
+    try:
+        while True:
+            try:
+                buf, data = windows.get(timeout=1.0)
+            except queue.Empty:
+                if not acquisition.is_alive():
+                    break
+                continue
+
+            eeg_data, dc_zi = remove_dc_offset(data, dc_zi, eeg_buf)
+            free_buffers.put(buf)  # remove_dc_offset copied the EEG rows out, so the buffer can be refilled
+            n = eeg_data.shape[1]
+            history[:, :-n] = history[:, n:]
+            history[:, -n:] = eeg_data
+            filled = min(filled + n, history_len)
+            pending += n
+
+            # Windows end every hop_size samples; skip the ones that would reach back past the valid history
+            num_windows, pending = divmod(pending, hop_size)
+            end = history_len - pending
+            if filled - pending < window_size:
+                continue
+            num_windows = min(num_windows, (filled - pending - window_size) // hop_size + 1)
+            span = history[:, end - window_size - (num_windows - 1) * hop_size:end]
+            epochs = sliding_window_view(span, window_size, axis=-1)[:, ::hop_size].swapaxes(0, 1)
+            # epochs: (num_windows, 3, window_size), oldest first
+            powers = compute_band_powers(epochs, sampling_rate, relative=True, return_labels=False)
+
+            for ratio in powers[:, 3] / powers[:, 2]:
+                if ratio > max_ratio:
+                    max_ratio = ratio
+                    increasing = True
+                else:
+                    increasing = False
+    finally:
+        stop_event.set()
+        acquisition.join(timeout=2)
 
     # board.stop_stream()  # board.release_session()
 
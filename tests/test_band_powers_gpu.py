@@ -0,0 +1,49 @@
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from bci_control import brainflow_stream
+
+# Enough of the CuPy API for the GPU path, backed by NumPy so it runs without a CUDA device
+_NUMPY_AS_CUPY = types.SimpleNamespace(arange=np.arange, asarray=np.asarray, asnumpy=np.asarray, fft=np.fft)
+
+
+class GpuBandPowersTest(unittest.TestCase):
+
+    def setUp(self):
+        brainflow_stream._welch_plan_gpu.cache_clear()
+        brainflow_stream._band_weights_gpu.cache_clear()
+        self.data = np.random.default_rng(0).standard_normal((2, 16, 1000)).astype(np.float32)
+
+    def _both_paths(self, **kwargs):
+        with mock.patch.object(brainflow_stream, "cp", None):
+            cpu = brainflow_stream.compute_band_powers(self.data, 250, return_labels=False, **kwargs)
+        with mock.patch.object(brainflow_stream, "cp", _NUMPY_AS_CUPY):
+            gpu = brainflow_stream.compute_band_powers(self.data, 250, return_labels=False, **kwargs)
+        return cpu, gpu
+
+    def test_matches_cpu_path(self):
+        for kwargs in ({}, {"relative": True}, {"relative": True, "return_log": True, "detrend": None},
+                       {"window_sec": 2, "nfft": 512}):
+            with self.subTest(**kwargs):
+                cpu, gpu = self._both_paths(**kwargs)
+                self.assertEqual(gpu.shape, (2, 5))
+                np.testing.assert_allclose(gpu, cpu, rtol=1e-4)
+
+    def test_device_constants_are_reused(self):
+        self._both_paths(relative=True)
+        self._both_paths(relative=True)
+        self.assertEqual(brainflow_stream._welch_plan_gpu.cache_info().misses, 1)
+        self.assertEqual(brainflow_stream._band_weights_gpu.cache_info().misses, 1)
+
+    def test_narrow_montage_stays_on_cpu(self):
+        with mock.patch.object(brainflow_stream, "cp", _NUMPY_AS_CUPY), \
+                mock.patch.object(brainflow_stream, "_welch_psd_gpu") as welch_gpu:
+            brainflow_stream.compute_band_powers(self.data[:, :3], 250, return_labels=False)
+        welch_gpu.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()